@@ -1,55 +1,498 @@
+from array import array
 import random
-from typing import Dict
+import sys
+from typing import Dict, Iterable
 import time
-from collections import deque
+
+# Локальне посилання на годинник: без пошуку атрибута модуля time при кожному виклику.
+# Монотонний годинник не залежить від переведення системного часу, а цілі
+# наносекунди дозволяють порівнювати мітки без похибок округлення.
+_now = time.monotonic_ns
+
+NS_PER_SECOND = 1_000_000_000
+
+# Через скільки вікон відбувається прибирання неактивних користувачів
+SWEEP_WINDOWS = 10
 
 class SlidingWindowRateLimiter:
     """
     Реалізація Rate Limiter з використанням алгоритму Sliding Window.
+
+    Конструктор повертає один із двох підкласів: _SingleRequestWindowLimiter
+    для max_requests == 1, що зберігає лише мітку останнього запиту, або
+    _RingBufferWindowLimiter з кільцевими буферами міток для решти випадків.
+    Підкласи реалізують _lookup, _check, _record і _wait_time, на яких
+    побудовано публічні методи.
     """
+    __slots__ = ('window_size', 'window_size_ns', 'max_requests', '_sweep_interval_ns', '_last_sweep')
+
+    def __new__(cls, window_size: int = 10, max_requests: int = 1):
+        if cls is SlidingWindowRateLimiter:
+            cls = _SingleRequestWindowLimiter if max_requests == 1 else _RingBufferWindowLimiter
+        return super().__new__(cls)
+
+    def __getnewargs__(self) -> tuple[int, int]:
+        # copy і pickle викликають __new__ з цими аргументами, тож відновлюється той самий клас
+        return self.window_size, self.max_requests
+
     def __init__(self, window_size: int = 10, max_requests: int = 1):
         """
         Ініціалізує Rate Limiter.
 
         :param window_size: Розмір часового вікна в секундах.
         :param max_requests: Максимальна кількість запитів у вікні.
+        :raises ValueError: Якщо max_requests менше 1.
         """
+        if max_requests < 1:
+            # Кільцевий буфер довжини 0 не може зберегти жодної мітки
+            raise ValueError(f"max_requests має бути не менше 1, отримано {max_requests}")
         self.window_size = window_size
+        self.window_size_ns = int(window_size * NS_PER_SECOND)
         self.max_requests = max_requests
-        # Зберігаємо історію повідомлень для кожного користувача
-        # у вигляді словника, де ключ — user_id, а значення — deque міток часу.
-        self.users_history: Dict[str, deque[float]] = {}
+        # Неактивних користувачів періодично прибирає _sweep, раз на SWEEP_WINDOWS вікон.
+        self._sweep_interval_ns = self.window_size_ns * SWEEP_WINDOWS
+        self._last_sweep = _now()
 
-    def _cleanup_window(self, user_id: str, current_time: float) -> None:
+    def can_send_message(self, user_id: str) -> bool:
+        """
+        Перевіряє, чи може користувач відправити повідомлення.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: True, якщо повідомлення можна відправити, інакше False.
+        """
+        return self._check(user_id, _now())
+
+    def can_send_batch(self, user_ids: Iterable[str]) -> list[bool]:
+        """
+        Перевіряє одразу кількох користувачів на один і той самий момент часу.
+
+        :param user_ids: Ідентифікатори користувачів.
+        :return: Список прапорців у порядку user_ids.
+        """
+        current_time = _now()
+        check = self._check
+        return [check(user_id, current_time) for user_id in user_ids]
+
+    def record_message(self, user_id: str) -> bool:
+        """
+        Записує нове повідомлення, якщо воно дозволене.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: True, якщо повідомлення записано, інакше False.
+        """
+        return self._record(user_id, _now())[0]
+
+    def time_until_next_allowed(self, user_id: str) -> float:
+        """
+        Розраховує час очікування до можливості відправлення наступного повідомлення.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Час очікування в секундах.
+        """
+        return self._wait_time(self._lookup(user_id), _now())
+
+    def admit(self, user_id: str) -> tuple[bool, float]:
+        """
+        Записує повідомлення, якщо воно дозволене, і розраховує час очікування.
+
+        Результат такий самий, як у record_message з подальшим
+        time_until_next_allowed, але стан користувача шукається лише один раз.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Кортеж (чи записано повідомлення, час очікування в секундах).
+        """
+        current_time = _now()
+        recorded, state = self._record(user_id, current_time)
+        return recorded, self._wait_time(state, current_time)
+
+class _RingBufferWindowLimiter(SlidingWindowRateLimiter):
+    """
+    Sliding Window з кільцевим буфером міток часу для кожного користувача.
+    """
+    __slots__ = ('_slots', '_free_slots', '_timestamps', '_head', '_count')
+
+    def __init__(self, window_size: int = 10, max_requests: int = 1):
+        """
+        Ініціалізує Rate Limiter.
+
+        :param window_size: Розмір часового вікна в секундах.
+        :param max_requests: Максимальна кількість запитів у вікні.
+        """
+        super().__init__(window_size, max_requests)
+        # Кожному користувачу призначається номер слота. Стан усіх користувачів
+        # зберігається в суцільних масивах (structure of arrays): кільцевий
+        # буфер слота займає max_requests комірок _timestamps, починаючи з
+        # slot * max_requests, а _head і _count — індекс голови та кількість міток.
+        # Мітки зберігаються як int64 без упаковки в об'єкти Python.
+        # Порожні буфери не звільняються одразу, а лише під час _sweep.
+        self._slots: Dict[str, int] = {}
+        self._free_slots: list[int] = []
+        self._timestamps = array('q')
+        self._head: list[int] = []
+        self._count: list[int] = []
+
+    def _lookup(self, user_id: str) -> int | None:
+        """
+        Повертає слот користувача без очищення вікна.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Слот користувача або None.
+        """
+        return self._slots.get(user_id)
+
+    def _cleanup_window(self, user_id: str, current_time: int) -> int | None:
         """
         Очищає застарілі запити з вікна користувача.
 
         :param user_id: Ідентифікатор користувача.
-        :param current_time: Поточна мітка часу.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Слот користувача або None, якщо слот йому не призначено.
         """
-        if user_id in self.users_history:
-            window_start_time = current_time - self.window_size
+        if current_time - self._last_sweep > self._sweep_interval_ns:
+            self._sweep(current_time)
+        slot = self._slots.get(user_id)
+        if slot is None:
+            return None
+        heads = self._head
+        counts = self._count
+        head = heads[slot]
+        count = counts[slot]
+        if count:
+            timestamps = self._timestamps
+            max_requests = self.max_requests
+            base = slot * max_requests
+            window_start_time = current_time - self.window_size_ns
             # Видаляємо всі мітки часу, які старші за початок вікна
-            while self.users_history[user_id] and self.users_history[user_id][0] < window_start_time:
-                self.users_history[user_id].popleft()
-            # Якщо після очищення deque порожній, видаляємо користувача зі словника
-            if not self.users_history[user_id]:
-                del self.users_history[user_id]
+            while count > 0 and timestamps[base + head] < window_start_time:
+                head += 1
+                if head == max_requests:
+                    head = 0
+                count -= 1
+            # Порожній буфер лишається за користувачем до наступного прибирання
+            heads[slot] = head
+            counts[slot] = count
+        return slot
 
-    def can_send_message(self, user_id: str) -> bool:
+    def _sweep(self, current_time: int) -> None:
         """
-        Перевіряє, чи може користувач відправити повідомлення.
+        Звільняє слоти користувачів, у яких не лишилося запитів у вікні.
+
+        :param current_time: Поточна мітка часу в наносекундах.
+        """
+        self._last_sweep = current_time
+        window_start_time = current_time - self.window_size_ns
+        timestamps = self._timestamps
+        heads = self._head
+        counts = self._count
+        max_requests = self.max_requests
+        stale = []
+        for user_id, slot in self._slots.items():
+            base = slot * max_requests
+            head = heads[slot]
+            count = counts[slot]
+            while count > 0 and timestamps[base + head] < window_start_time:
+                head += 1
+                if head == max_requests:
+                    head = 0
+                count -= 1
+            heads[slot] = head
+            counts[slot] = count
+            if count == 0:
+                stale.append(user_id)
+        pop_slot = self._slots.pop
+        self._free_slots.extend(pop_slot(user_id) for user_id in stale)
+
+    def _allocate_slot(self, user_id: str) -> int:
+        """
+        Призначає користувачу слот, повторно використовуючи звільнені.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Номер слота.
+        """
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._head[slot] = 0
+            self._count[slot] = 0
+        else:
+            slot = len(self._head)
+            self._timestamps.extend([0] * self.max_requests)
+            self._head.append(0)
+            self._count.append(0)
+        # Ключ інтернується, щоб пошук за інтернованими user_id вирішувався порівнянням вказівників
+        self._slots[sys.intern(user_id)] = slot
+        return slot
+
+    def _check(self, user_id: str, current_time: int) -> bool:
+        """
+        Перевіряє ліміт користувача на момент current_time, не змінюючи стану.
+
+        Вікно тут не очищається: якщо буфер заповнений, достатньо перевірити,
+        чи вийшла за межі вікна найстаріша мітка. Клас не потокобезпечний:
+        паралельний запис або прибирання може перепризначити слот між
+        пошуком слота і читанням його масивів.
 
         :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
         :return: True, якщо повідомлення можна відправити, інакше False.
         """
-        current_time = time.time()
-        self._cleanup_window(user_id, current_time)
+        slot = self._slots.get(user_id)
         # Якщо користувача немає в історії або кількість його запитів
         # менша за ліміт, він може відправити повідомлення.
-        if user_id not in self.users_history or len(self.users_history[user_id]) < self.max_requests:
+        if slot is None or self._count[slot] < self.max_requests:
             return True
-        return False
+        oldest_message_time = self._timestamps[slot * self.max_requests + self._head[slot]]
+        return oldest_message_time < current_time - self.window_size_ns
+
+    def _record(self, user_id: str, current_time: int) -> tuple[bool, int]:
+        """
+        Записує повідомлення на момент current_time, якщо ліміт не вичерпано.
+
+        :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Кортеж (чи записано повідомлення, слот користувача).
+        """
+        slot = self._cleanup_window(user_id, current_time)
+        if slot is None:
+            slot = self._allocate_slot(user_id)
+        counts = self._count
+        count = counts[slot]
+        max_requests = self.max_requests
+        if count >= max_requests:
+            return False, slot
+        self._timestamps[slot * max_requests + (self._head[slot] + count) % max_requests] = current_time
+        counts[slot] = count + 1
+        return True, slot
+
+    def _wait_time(self, slot: int | None, current_time: int) -> float:
+        """
+        Розраховує час очікування для слота.
+
+        Очищення вікна не потрібне: якщо найстаріша мітка вже застаріла,
+        розрахований час від'ємний і обмежується нулем.
+
+        :param slot: Слот користувача або None.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Час очікування в секундах.
+        """
+        # Якщо користувача немає або він може відправити повідомлення,
+        # час очікування дорівнює 0.
+        if slot is None or self._count[slot] < self.max_requests:
+            return 0.0
+        # Час очікування — це час, що залишився до кінця вікна
+        # після найстарішого запиту.
+        oldest_message_time = self._timestamps[slot * self.max_requests + self._head[slot]]
+        wait_time = self.window_size_ns - (current_time - oldest_message_time)
+        return wait_time / NS_PER_SECOND if wait_time > 0 else 0.0
+
+class _SingleRequestWindowLimiter(SlidingWindowRateLimiter):
+    """
+    Sliding Window з лімітом в один запит на вікно.
+
+    У такому вікні завжди не більше однієї мітки часу, тож алгоритм
+    збігається з Throttling з інтервалом window_size: кільцевий буфер
+    не потрібен, достатньо словника user_id -> мітка останнього запиту.
+    """
+    __slots__ = ('_last_message_time',)
+
+    def __init__(self, window_size: int = 10, max_requests: int = 1):
+        """
+        Ініціалізує Rate Limiter.
+
+        :param window_size: Розмір часового вікна в секундах.
+        :param max_requests: Максимальна кількість запитів у вікні (завжди 1).
+        """
+        super().__init__(window_size, max_requests)
+        # Мітки часу останніх повідомлень у наносекундах
+        self._last_message_time: Dict[str, int] = {}
+
+    def _lookup(self, user_id: str) -> int | None:
+        """
+        Повертає мітку останнього повідомлення користувача.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Мітка часу в наносекундах або None.
+        """
+        return self._last_message_time.get(user_id)
+
+    def _sweep(self, current_time: int) -> None:
+        """
+        Видаляє користувачів, чия остання мітка вийшла за межі вікна.
+
+        :param current_time: Поточна мітка часу в наносекундах.
+        """
+        self._last_sweep = current_time
+        window_start_time = current_time - self.window_size_ns
+        stale = [user_id for user_id, last_time in self._last_message_time.items()
+                 if last_time < window_start_time]
+        for user_id in stale:
+            del self._last_message_time[user_id]
+
+    def _check(self, user_id: str, current_time: int) -> bool:
+        """
+        Перевіряє, чи минуло вікно з останнього повідомлення користувача.
+
+        :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: True, якщо повідомлення можна відправити, інакше False.
+        """
+        last_time = self._last_message_time.get(user_id)
+        if last_time is None:
+            return True
+        return (current_time - last_time) > self.window_size_ns
+
+    def can_send_batch(self, user_ids: Iterable[str]) -> list[bool]:
+        """
+        Перевіряє одразу кількох користувачів на один і той самий момент часу.
+
+        :param user_ids: Ідентифікатори користувачів.
+        :return: Список прапорців у порядку user_ids.
+        """
+        window_start_time = _now() - self.window_size_ns
+        get = self._last_message_time.get
+        return [(last_time := get(user_id)) is None or last_time < window_start_time
+                for user_id in user_ids]
+
+    def _record(self, user_id: str, current_time: int) -> tuple[bool, int]:
+        """
+        Записує повідомлення на момент current_time, якщо вікно з останнього минуло.
+
+        :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Кортеж (чи записано повідомлення, мітка останнього повідомлення).
+        """
+        if current_time - self._last_sweep > self._sweep_interval_ns:
+            self._sweep(current_time)
+        last_time = self._last_message_time.get(user_id)
+        if last_time is None:
+            # Ключ нового користувача інтернується, як і в _allocate_slot
+            self._last_message_time[sys.intern(user_id)] = current_time
+            return True, current_time
+        if (current_time - last_time) > self.window_size_ns:
+            self._last_message_time[user_id] = current_time
+            return True, current_time
+        return False, last_time
+
+    def _wait_time(self, last_time: int | None, current_time: int) -> float:
+        """
+        Розраховує час очікування за міткою останнього повідомлення.
+
+        :param last_time: Мітка останнього повідомлення або None.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Час очікування в секундах.
+        """
+        if last_time is None:
+            return 0.0
+        wait_time = self.window_size_ns - (current_time - last_time)
+        return wait_time / NS_PER_SECOND if wait_time > 0 else 0.0
+
+class ApproximateSlidingWindowRateLimiter:
+    """
+    Наближена реалізація Sliding Window на двох лічильниках (поточне та попереднє вікно).
+
+    Замість міток часу кожного запиту для користувача зберігається лише
+    кортеж (prev_count, curr_count, window_index), тому пам'ять і час
+    обробки не залежать від max_requests. Кількість запитів у ковзному вікні
+    оцінюється як prev_count * частка_перекриття + curr_count.
+    """
+    __slots__ = ('window_size', 'window_size_ns', 'max_requests', 'users_state',
+                 '_sweep_interval_ns', '_last_sweep')
+
+    def __init__(self, window_size: int = 10, max_requests: int = 1):
+        """
+        Ініціалізує Rate Limiter.
+
+        :param window_size: Розмір часового вікна в секундах.
+        :param max_requests: Максимальна кількість запитів у вікні.
+        :raises ValueError: Якщо max_requests менше 1.
+        """
+        if max_requests < 1:
+            raise ValueError(f"max_requests має бути не менше 1, отримано {max_requests}")
+        self.window_size = window_size
+        self.window_size_ns = int(window_size * NS_PER_SECOND)
+        self.max_requests = max_requests
+        # Для кожного користувача: (кількість у попередньому вікні,
+        # кількість у поточному вікні, індекс поточного вікна).
+        self.users_state: Dict[str, tuple[int, int, int]] = {}
+        # Користувачів, чиї лічильники застаріли, прибирає _sweep, раз на SWEEP_WINDOWS вікон.
+        self._sweep_interval_ns = self.window_size_ns * SWEEP_WINDOWS
+        self._last_sweep = _now()
+
+    def _sweep(self, current_time: int) -> None:
+        """
+        Видаляє користувачів, у яких обидва лічильники вже не впливають на оцінку.
+
+        :param current_time: Поточна мітка часу в наносекундах.
+        """
+        self._last_sweep = current_time
+        # Стан з індексом, старшим за попереднє вікно, дає (0, 0) у _current_counts
+        oldest_index = current_time // self.window_size_ns - 1
+        stale = [user_id for user_id, (_, _, index) in self.users_state.items()
+                 if index < oldest_index]
+        for user_id in stale:
+            del self.users_state[user_id]
+
+    def _current_counts(self, state: tuple[int, int, int] | None, current_time: int) -> tuple[int, int]:
+        """
+        Повертає лічильники (prev_count, curr_count) відносно вікна, до якого належить current_time.
+
+        :param state: Збережений стан користувача або None.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Кортеж (prev_count, curr_count).
+        """
+        if state is None:
+            return 0, 0
+        prev_count, curr_count, index = state
+        window_index = current_time // self.window_size_ns
+        if index == window_index:
+            return prev_count, curr_count
+        if index == window_index - 1:
+            # Поточне вікно стало попереднім
+            return curr_count, 0
+        return 0, 0
+
+    def _effective_count(self, prev_count: int, curr_count: int, current_time: int) -> float:
+        """
+        Оцінює кількість запитів у ковзному вікні, що закінчується в current_time.
+
+        :param prev_count: Кількість запитів у попередньому фіксованому вікні.
+        :param curr_count: Кількість запитів у поточному фіксованому вікні.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Зважена кількість запитів.
+        """
+        overlap = (self.window_size_ns - current_time % self.window_size_ns) / self.window_size_ns
+        return prev_count * overlap + curr_count
+
+    def can_send_message(self, user_id: str) -> bool:
+        """
+        Перевіряє, чи може користувач відправити повідомлення.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: True, якщо повідомлення можна відправити, інакше False.
+        """
+        current_time = _now()
+        state = self.users_state.get(user_id)
+        prev_count, curr_count = self._current_counts(state, current_time)
+        return self._effective_count(prev_count, curr_count, current_time) < self.max_requests
+
+    def _record(self, user_id: str, current_time: int) -> tuple[bool, int, int]:
+        """
+        Записує повідомлення на момент current_time, якщо оцінка нижча за ліміт.
+
+        :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Кортеж (чи записано повідомлення, prev_count, curr_count) після запису.
+        """
+        if current_time - self._last_sweep > self._sweep_interval_ns:
+            self._sweep(current_time)
+        state = self.users_state.get(user_id)
+        prev_count, curr_count = self._current_counts(state, current_time)
+        if self._effective_count(prev_count, curr_count, current_time) >= self.max_requests:
+            return False, prev_count, curr_count
+        curr_count += 1
+        # Ключ нового користувача інтернується, як і в SlidingWindowRateLimiter
+        key = user_id if state is not None else sys.intern(user_id)
+        self.users_state[key] = (prev_count, curr_count, current_time // self.window_size_ns)
+        return True, prev_count, curr_count
 
     def record_message(self, user_id: str) -> bool:
         """
@@ -58,13 +501,29 @@ class SlidingWindowRateLimiter:
         :param user_id: Ідентифікатор користувача.
         :return: True, якщо повідомлення записано, інакше False.
         """
-        if self.can_send_message(user_id):
-            current_time = time.time()
-            if user_id not in self.users_history:
-                self.users_history[user_id] = deque()
-            self.users_history[user_id].append(current_time)
-            return True
-        return False
+        return self._record(user_id, _now())[0]
+
+    def _wait_time(self, prev_count: int, curr_count: int, current_time: int) -> float:
+        """
+        Розраховує час, за який оцінка кількості запитів опуститься нижче ліміту.
+
+        :param prev_count: Кількість запитів у попередньому фіксованому вікні.
+        :param curr_count: Кількість запитів у поточному фіксованому вікні.
+        :param current_time: Поточна мітка часу в наносекундах.
+        :return: Час очікування в секундах.
+        """
+        if self._effective_count(prev_count, curr_count, current_time) < self.max_requests:
+            return 0.0
+        window_size_ns = self.window_size_ns
+        elapsed = current_time % window_size_ns
+        if curr_count >= self.max_requests:
+            # У поточному вікні оцінка вже не зменшиться: чекаємо на наступне,
+            # де curr_count стане prev_count і зменшуватиметься лінійно.
+            wait_time = (window_size_ns - elapsed) + window_size_ns * (1 - self.max_requests / curr_count)
+            return wait_time / NS_PER_SECOND
+        # Оцінка зменшується лінійно: prev_count * (1 - f) + curr_count < max_requests
+        wait_time = window_size_ns * (1 - (self.max_requests - curr_count) / prev_count) - elapsed
+        return wait_time / NS_PER_SECOND if wait_time > 0 else 0.0
 
     def time_until_next_allowed(self, user_id: str) -> float:
         """
@@ -73,18 +532,22 @@ class SlidingWindowRateLimiter:
         :param user_id: Ідентифікатор користувача.
         :return: Час очікування в секундах.
         """
-        current_time = time.time()
-        self._cleanup_window(user_id, current_time)
-        # Якщо користувача немає або він може відправити повідомлення,
-        # час очікування дорівнює 0.
-        if user_id not in self.users_history or len(self.users_history[user_id]) < self.max_requests:
-            return 0.0
-        # Час очікування — це час, що залишився до кінця вікна
-        # після найстарішого запиту.
-        oldest_message_time = self.users_history[user_id][0]
-        wait_time = self.window_size - (current_time - oldest_message_time)
-        return max(0, wait_time)
-    
+        current_time = _now()
+        state = self.users_state.get(user_id)
+        prev_count, curr_count = self._current_counts(state, current_time)
+        return self._wait_time(prev_count, curr_count, current_time)
+
+    def admit(self, user_id: str) -> tuple[bool, float]:
+        """
+        Записує повідомлення, якщо воно дозволене, і розраховує час очікування.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Кортеж (чи записано повідомлення, час очікування в секундах).
+        """
+        current_time = _now()
+        recorded, prev_count, curr_count = self._record(user_id, current_time)
+        return recorded, self._wait_time(prev_count, curr_count, current_time)
+
 # Демонстрація роботи
 
 # ANSI escape-послідовності для кольору та скидання кольору
@@ -93,29 +556,56 @@ GREEN = '\033[92m' # Код для яскраво-зеленого кольор
 BLUE = '\033[94m'  # Код для яскраво-синього кольору
 RESET = '\033[0m'
 
-def test_rate_limiter():
+# Готові рядки статусу: успішний не змінюється, у відхилений підставляється час очікування
+STATUS_OK = GREEN + "✓" + RESET
+STATUS_FAIL = RED + "×" + RESET + " (очікування %.1fс)"
+
+def _send_series(limiter, message_ids: range, quiet: bool) -> None:
+    """
+    Надсилає серію повідомлень і виводить результати одним записом після серії.
+
+    :param limiter: Rate Limiter, через який проходять повідомлення.
+    :param message_ids: Номери повідомлень серії.
+    :param quiet: Якщо True, результати не форматуються і не виводяться, а паузи
+                  між повідомленнями пропускаються, щоб вимірювати лише виклики лімітера.
+    """
+    lines = []
+    for message_id in message_ids:
+        user_id = sys.intern(str(message_id % 5 + 1))
+        result, wait_time = limiter.admit(user_id)
+        if not quiet:
+            status = STATUS_OK if result else STATUS_FAIL % wait_time
+            lines.append(f"Повідомлення {message_id:2d} | Користувач {user_id} | {status}")
+            time.sleep(random.uniform(0.1, 1.0))
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def test_rate_limiter(quiet: bool = False):
     limiter = SlidingWindowRateLimiter(window_size=10, max_requests=1)
 
-    print(f"{BLUE}\n=== Симуляція потоку повідомлень ==={RESET}")
-    for message_id in range(1, 11):
-        user_id = message_id % 5 + 1
-        result = limiter.record_message(str(user_id))
-        wait_time = limiter.time_until_next_allowed(str(user_id))
-        print(f"Повідомлення {message_id:2d} | Користувач {user_id} | "
-              f"{f'{GREEN}✓{RESET}' if result else f'{RED}×{RESET} (очікування {wait_time:.1f}с)'}")
-        time.sleep(random.uniform(0.1, 1.0))
-
-    print(f"{GREEN}\nОчікуємо 4 секунди...{RESET}")
-    time.sleep(4)
-
-    print(f"{BLUE}\n=== Нова серія повідомлень після очікування ==={RESET}")
-    for message_id in range(11, 21):
-        user_id = message_id % 5 + 1
-        result = limiter.record_message(str(user_id))
-        wait_time = limiter.time_until_next_allowed(str(user_id))
-        print(f"Повідомлення {message_id:2d} | Користувач {user_id} | "
-              f"{f'{GREEN}✓{RESET}' if result else f'{RED}×{RESET} (очікування {wait_time:.1f}с)'}")
-        time.sleep(random.uniform(0.1, 1.0))
+    if not quiet:
+        print(f"{BLUE}\n=== Симуляція потоку повідомлень ==={RESET}")
+    _send_series(limiter, range(1, 11), quiet)
+
+    if not quiet:
+        print(f"{GREEN}\nОчікуємо 4 секунди...{RESET}")
+        time.sleep(4)
+        print(f"{BLUE}\n=== Нова серія повідомлень після очікування ==={RESET}")
+    _send_series(limiter, range(11, 21), quiet)
+
+def test_approximate_rate_limiter(quiet: bool = False):
+    limiter = ApproximateSlidingWindowRateLimiter(window_size=10, max_requests=2)
+
+    if not quiet:
+        print(f"{BLUE}\n=== Симуляція потоку повідомлень (наближений Sliding Window) ==={RESET}")
+    _send_series(limiter, range(1, 11), quiet)
+
+    if not quiet:
+        print(f"{GREEN}\nОчікуємо 4 секунди...{RESET}")
+        time.sleep(4)
+        print(f"{BLUE}\n=== Нова серія повідомлень після очікування ==={RESET}")
+    _send_series(limiter, range(11, 21), quiet)
 
 if __name__ == "__main__":
-    test_rate_limiter()
\ No newline at end of file
+    test_rate_limiter()
+    test_approximate_rate_limiter()
\ No newline at end of file
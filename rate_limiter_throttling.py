@@ -1,6 +1,25 @@
+import threading
 import time
 from typing import Dict
 import random
+import sys
+
+# Функція годинника, прив'язана один раз на рівні модуля. Монотонні
+# наносекунди не стрибають при зміні системного часу.
+_now = time.monotonic_ns
+
+NS_PER_SECOND = 1_000_000_000
+
+class _UserState:
+    """
+    Стан одного користувача: мітка останнього повідомлення та власний замок.
+    """
+    __slots__ = ('last_time', 'lock')
+
+    def __init__(self):
+        # Мітка часу останнього повідомлення в наносекундах
+        self.last_time: int | None = None
+        self.lock = threading.Lock()
 
 class ThrottlingRateLimiter:
     """
@@ -8,7 +27,13 @@ class ThrottlingRateLimiter:
     
     Цей клас контролює частоту повідомлень, забезпечуючи фіксований мінімальний
     інтервал між повідомленнями для кожного користувача.
+
+    Запис повідомлення потокобезпечний: кожен користувач має власний замок,
+    тому паралельні виклики для різних користувачів не блокують один одного.
+    Перевірки лише читають мітку часу і замок не захоплюють.
     """
+    __slots__ = ('min_interval', 'min_interval_ns', 'users_state')
+
     def __init__(self, min_interval: float = 10.0):
         """
         Ініціалізує лімітер.
@@ -16,20 +41,34 @@ class ThrottlingRateLimiter:
         :param min_interval: Мінімальний інтервал у секундах між повідомленнями.
         """
         self.min_interval = min_interval
-        self.last_message_time: Dict[str, float] = {}
+        self.min_interval_ns = int(min_interval * NS_PER_SECOND)
+        self.users_state: Dict[str, _UserState] = {}
 
-    def can_send_message(self, user_id: str) -> bool:
+    def _check(self, user_id: str, current_time: int) -> bool:
         """
-        Перевіряє, чи може користувач відправити повідомлення.
+        Перевіряє, чи минув мінімальний інтервал на момент current_time.
 
         :param user_id: Ідентифікатор користувача.
+        :param current_time: Поточна мітка часу в наносекундах.
         :return: True, якщо повідомлення можна відправити, інакше False.
         """
-        last_time = self.last_message_time.get(user_id)
+        state = self.users_state.get(user_id)
+        if state is None:
+            return True
+        last_time = state.last_time
         if last_time is None:
             return True
         
-        return (time.time() - last_time) >= self.min_interval
+        return (current_time - last_time) >= self.min_interval_ns
+
+    def can_send_message(self, user_id: str) -> bool:
+        """
+        Перевіряє, чи може користувач відправити повідомлення.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: True, якщо повідомлення можна відправити, інакше False.
+        """
+        return self._check(user_id, _now())
 
     def record_message(self, user_id: str) -> bool:
         """
@@ -38,10 +77,18 @@ class ThrottlingRateLimiter:
         :param user_id: Ідентифікатор користувача.
         :return: True, якщо повідомлення було записано, інакше False.
         """
-        if self.can_send_message(user_id):
-            self.last_message_time[user_id] = time.time()
+        state = self.users_state.get(user_id)
+        if state is None:
+            # setdefault атомарний, тож паралельні виклики отримають один і той самий стан;
+            # інтернований ключ прискорює подальші пошуки за інтернованими user_id
+            state = self.users_state.setdefault(sys.intern(user_id), _UserState())
+        with state.lock:
+            current_time = _now()
+            last_time = state.last_time
+            if last_time is not None and (current_time - last_time) < self.min_interval_ns:
+                return False
+            state.last_time = current_time
             return True
-        return False
 
     def time_until_next_allowed(self, user_id: str) -> float:
         """
@@ -50,12 +97,32 @@ class ThrottlingRateLimiter:
         :param user_id: Ідентифікатор користувача.
         :return: Час очікування в секундах.
         """
-        last_time = self.last_message_time.get(user_id)
+        state = self.users_state.get(user_id)
+        last_time = None if state is None else state.last_time
         if last_time is None:
             return 0.0
             
-        time_to_wait = self.min_interval - (time.time() - last_time)
-        return max(0, time_to_wait)
+        time_to_wait = self.min_interval_ns - (_now() - last_time)
+        return time_to_wait / NS_PER_SECOND if time_to_wait > 0 else 0.0
+
+    def admit(self, user_id: str) -> tuple[bool, float]:
+        """
+        Записує повідомлення, якщо воно дозволене, і розраховує час очікування.
+
+        :param user_id: Ідентифікатор користувача.
+        :return: Кортеж (чи записано повідомлення, час очікування в секундах).
+        """
+        state = self.users_state.get(user_id)
+        if state is None:
+            state = self.users_state.setdefault(sys.intern(user_id), _UserState())
+        with state.lock:
+            current_time = _now()
+            last_time = state.last_time
+            if last_time is not None and (current_time - last_time) < self.min_interval_ns:
+                time_to_wait = self.min_interval_ns - (current_time - last_time)
+                return False, time_to_wait / NS_PER_SECOND
+            state.last_time = current_time
+            return True, self.min_interval_ns / NS_PER_SECOND
 
 # ANSI escape-послідовності для кольору та скидання кольору
 RED = '\033[91m'
@@ -63,33 +130,43 @@ GREEN = '\033[92m' # Код для яскраво-зеленого кольор
 BLUE = '\033[94m'  # Код для яскраво-синього кольору
 RESET = '\033[0m'
 
-def test_throttling_limiter():
-    limiter = ThrottlingRateLimiter(min_interval=10.0)
-
-    print(f"{BLUE}\n=== Симуляція потоку повідомлень (Throttling) ==={RESET}")
-    for message_id in range(1, 11):
-        user_id = message_id % 5 + 1
-
-        result = limiter.record_message(str(user_id))
-        wait_time = limiter.time_until_next_allowed(str(user_id))
+# Готові рядки статусу: успішний не змінюється, у відхилений підставляється час очікування
+STATUS_OK = GREEN + "✓" + RESET
+STATUS_FAIL = RED + "×" + RESET + " (очікування %.1fс)"
 
-        print(f"Повідомлення {message_id:2d} | Користувач {user_id} | "
-              f"{f'{GREEN}✓{RESET}' if result else f'{RED}×{RESET} (очікування {wait_time:.1f}с)'}")
+def _send_series(limiter, message_ids: range, quiet: bool) -> None:
+    """
+    Надсилає серію повідомлень і виводить результати одним записом після серії.
 
-        # Випадкова затримка між повідомленнями
-        time.sleep(random.uniform(0.1, 1.0))
+    :param limiter: Rate Limiter, через який проходять повідомлення.
+    :param message_ids: Номери повідомлень серії.
+    :param quiet: Якщо True, результати не форматуються і не виводяться, а паузи
+                  між повідомленнями пропускаються, щоб вимірювати лише виклики лімітера.
+    """
+    lines = []
+    for message_id in message_ids:
+        user_id = sys.intern(str(message_id % 5 + 1))
+        result, wait_time = limiter.admit(user_id)
+        if not quiet:
+            status = STATUS_OK if result else STATUS_FAIL % wait_time
+            lines.append(f"Повідомлення {message_id:2d} | Користувач {user_id} | {status}")
+            # Випадкова затримка між повідомленнями
+            time.sleep(random.uniform(0.1, 1.0))
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def test_throttling_limiter(quiet: bool = False):
+    limiter = ThrottlingRateLimiter(min_interval=10.0)
 
-    print(f"{GREEN}\nОчікуємо 10 секунд...{RESET}")
-    time.sleep(10)
+    if not quiet:
+        print(f"{BLUE}\n=== Симуляція потоку повідомлень (Throttling) ==={RESET}")
+    _send_series(limiter, range(1, 11), quiet)
 
-    print(f"{BLUE}\n=== Нова серія повідомлень після очікування ==={RESET}")
-    for message_id in range(11, 21):
-        user_id = message_id % 5 + 1
-        result = limiter.record_message(str(user_id))
-        wait_time = limiter.time_until_next_allowed(str(user_id))
-        print(f"Повідомлення {message_id:2d} | Користувач {user_id} | "
-              f"{f'{GREEN}✓{RESET}' if result else f'{RED}×{RESET} (очікування {wait_time:.1f}с)'}")
-        time.sleep(random.uniform(0.1, 1.0))
+    if not quiet:
+        print(f"{GREEN}\nОчікуємо 10 секунд...{RESET}")
+        time.sleep(10)
+        print(f"{BLUE}\n=== Нова серія повідомлень після очікування ==={RESET}")
+    _send_series(limiter, range(11, 21), quiet)
 
 if __name__ == "__main__":
     test_throttling_limiter()
\ No newline at end of file